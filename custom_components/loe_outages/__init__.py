@@ -5,18 +5,49 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+import voluptuous as vol
 from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
 
+from .const import ATTR_CYCLES, DEFAULT_PROFILE_CYCLES, DOMAIN, SERVICE_PROFILE
 from .coordinator import LoeOutagesCoordinator
+from .ics import LoeOutagesIcsView
+from .profiler import LoeOutagesProfiler
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.CALENDAR, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+    },
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the integration-wide iCalendar feed view and services."""
+    hass.http.register_view(LoeOutagesIcsView)
+    profiler = hass.data[DOMAIN] = LoeOutagesProfiler(hass)
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE,
+        profiler.async_handle_service,
+        schema=PROFILE_SCHEMA,
+    )
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up a new entry."""
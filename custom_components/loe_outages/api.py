@@ -1,10 +1,13 @@
 """API for Loe outages."""
 
+import asyncio
 import logging
 import aiohttp
 import datetime
 import pytz
-from .models import OutageSchedule, Interval
+from .const import API_BASE_URL
+from .models import SLOT_DURATION, OutageSchedule, Interval, shift_bits
+from .profiler import LoeOutagesProfiler
 
 LOGGER = logging.getLogger(__name__)
 
@@ -13,15 +16,25 @@ class LoeOutagesApi:
     """Class to interact with API for Loe outages."""
 
     schedules: list[OutageSchedule]
+    revision: int
 
-    def __init__(self, group: str) -> None:
+    def __init__(
+        self,
+        group: str,
+        base_url: str = API_BASE_URL,
+        profiler: LoeOutagesProfiler | None = None,
+    ) -> None:
         """Initialize the LoeOutagesApi."""
         self.group = group
+        self.base_url = base_url
+        self.profiler = profiler
         self.schedules = []
+        self.revision = 0
+        self._fetch_task: asyncio.Task | None = None
 
     async def async_fetch_latest_json(self) -> dict:
         """Fetch outages from the async API endpoint."""
-        url = "https://lps.yuriishunkin.com/api/Schedule/latest"
+        url = f"{self.base_url}/latest"
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
                 if response.status == 200:
@@ -33,7 +46,7 @@ class LoeOutagesApi:
 
     async def async_fetch_all_json(self) -> dict:
         """Fetch outages from the async API endpoint."""
-        url = "https://lps.yuriishunkin.com/api/Schedule/all"
+        url = f"{self.base_url}/all"
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
                 if response.status == 200:
@@ -44,18 +57,38 @@ class LoeOutagesApi:
                     return None
 
     async def async_fetch_schedules(self) -> None:
+        """Fetch outages, sharing one in-flight request between callers."""
+        if self._fetch_task is None or self._fetch_task.done():
+            self._fetch_task = asyncio.ensure_future(self._async_fetch_schedules())
+        else:
+            LOGGER.debug("Joining in-flight schedules fetch")
+        # Shield so a cancelled caller does not abort the fetch for the others
+        await asyncio.shield(self._fetch_task)
+
+    async def _async_fetch_schedules(self) -> None:
         """Fetch outages from the JSON response."""
         if len(self.schedules) == 0:
             LOGGER.debug("Fetching all schedules")
-            schedules_data = await self.async_fetch_all_json()
-            schedules = OutageSchedule.from_list(schedules_data)
+            data = await self.async_fetch_all_json()
+            latest = False
+        else:
+            LOGGER.debug("Fetching latest schedules")
+            data = await self.async_fetch_latest_json()
+            latest = True
+        if self.profiler is None or not self.profiler.active:
+            return self._store_schedules(data, latest=latest)
+        with self.profiler.profile():
+            return self._store_schedules(data, latest=latest)
+
+    def _store_schedules(self, data: dict | list, *, latest: bool) -> None:
+        """Parse fetched JSON and merge it into the loaded schedules."""
+        previous_ids = [schedule.id for schedule in self.schedules]
+        if not latest:
+            schedules = OutageSchedule.from_list(data)
             for schedule in sorted(schedules, key=lambda s: s.date):
                 self.schedules.append(schedule)
-            return None
         else:
-            LOGGER.debug("Fetching latest schedules")
-            schedule_data = await self.async_fetch_latest_json()
-            new_schedule = OutageSchedule.from_dict(schedule_data)
+            new_schedule = OutageSchedule.from_dict(data)
             self.schedules = [
                 item
                 for item in self.schedules
@@ -64,6 +97,9 @@ class LoeOutagesApi:
             self.schedules.append(new_schedule)
         self.schedules.sort(key=lambda item: item.date)
         LOGGER.debug("Saved schedules %s", list(map(lambda s: s.date, self.schedules)))
+        if [schedule.id for schedule in self.schedules] != previous_ids:
+            self.revision += 1
+            LOGGER.debug("Schedules revision changed to %s", self.revision)
         return None
 
     def get_current_event(self, at: datetime.datetime) -> Interval | None:
@@ -111,6 +147,68 @@ class LoeOutagesApi:
 
         return self._merge_intervals(sorted(result, key=lambda i: i.startTime))
 
+    def get_off_bitmaps(
+        self,
+        start: datetime.datetime,
+        slots: int,
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """Get (covered, off) slot bitmaps of every group, bit 0 being at start.
+
+        The start must be aligned to SLOT_DURATION. Newer schedules take
+        precedence over older ones for the slots they cover. Slots without a
+        covered bit have no published schedule and are unknown, not on.
+        """
+        start = start.astimezone(pytz.UTC)
+        window = (1 << slots) - 1
+        covered_by_group: dict[str, int] = {}
+        off_by_group: dict[str, int] = {}
+        twoDaysBeforeStart = start + datetime.timedelta(days=-2)
+        for schedule in reversed(self.schedules):
+            if schedule.date < twoDaysBeforeStart:
+                break
+
+            shift = (schedule.date - start) // SLOT_DURATION
+            for group_id, covered in schedule.covered_bitmaps.items():
+                covered = shift_bits(covered, shift) & window
+                already_covered = covered_by_group.get(group_id, 0)
+                off = shift_bits(schedule.off_bitmaps[group_id], shift)
+                off_by_group[group_id] = off_by_group.get(group_id, 0) | (
+                    off & covered & ~already_covered
+                )
+                covered_by_group[group_id] = already_covered | covered
+
+        return covered_by_group, off_by_group
+
+    def get_timeline(self) -> list[Interval]:
+        """Get all intervals of the group, sorted, merged and non-overlapping.
+
+        Newer schedules take precedence: intervals of older schedules are
+        clipped to the time no newer schedule covers.
+        """
+        covered: list[tuple[datetime.datetime, datetime.datetime]] = []
+        result = []
+        for schedule in reversed(self.schedules):
+            schedule_ranges = []
+            for group in schedule.groups:
+                if group.id != self.group:
+                    continue
+                for interval in group.intervals:
+                    schedule_ranges.append((interval.startTime, interval.endTime))
+                    for start, end in _subtract_ranges(
+                        interval.startTime, interval.endTime, covered
+                    ):
+                        if start == interval.startTime and end == interval.endTime:
+                            result.append(interval)
+                        else:
+                            result.append(
+                                Interval(
+                                    state=interval.state, startTime=start, endTime=end
+                                )
+                            )
+            covered = _union_ranges(covered + schedule_ranges)
+
+        return self._merge_intervals(sorted(result, key=lambda i: i.startTime))
+
     def _merge_intervals(self, intervals: list[Interval]) -> list[Interval]:
         if not intervals:
             return []
@@ -126,8 +224,41 @@ class LoeOutagesApi:
                 )
             else:
                 merged_intervals.append(current)
-        [
-            LOGGER.debug("merged: from: %s, to: %s", inter.startTime, inter.endTime)
-            for inter in merged_intervals
-        ]
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            for inter in merged_intervals:
+                LOGGER.debug("merged: from: %s, to: %s", inter.startTime, inter.endTime)
         return merged_intervals
+
+
+def _union_ranges(
+    ranges: list[tuple[datetime.datetime, datetime.datetime]],
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """Merge overlapping or touching ranges into sorted disjoint ones."""
+    union: list[tuple[datetime.datetime, datetime.datetime]] = []
+    for start, end in sorted(ranges):
+        if union and start <= union[-1][1]:
+            union[-1] = (union[-1][0], max(union[-1][1], end))
+        else:
+            union.append((start, end))
+    return union
+
+
+def _subtract_ranges(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    covered: list[tuple[datetime.datetime, datetime.datetime]],
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """Return the parts of start..end outside the sorted disjoint covered ranges."""
+    parts = []
+    current = start
+    for covered_start, covered_end in covered:
+        if covered_end <= current:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > current:
+            parts.append((current, covered_start))
+        current = max(current, covered_end)
+    if current < end:
+        parts.append((current, end))
+    return parts
@@ -13,7 +13,14 @@ from homeassistant.config_entries import (
 from homeassistant.core import callback
 from homeassistant.helpers.selector import selector
 
-from .const import CONF_GROUP, DEFAULT_GROUP, DOMAIN
+from .const import (
+    CONF_GROUP,
+    CONF_LOOKAHEAD,
+    DEFAULT_GROUP,
+    DEFAULT_LOOKAHEAD,
+    DOMAIN,
+    LOOKAHEAD_UNBOUNDED,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +54,24 @@ def build_schema(config_entry: ConfigEntry) -> vol.Schema:
                     },
                 },
             ),
+            vol.Required(
+                CONF_LOOKAHEAD,
+                default=get_config_value(
+                    config_entry, CONF_LOOKAHEAD, DEFAULT_LOOKAHEAD
+                ),
+            ): selector(
+                {
+                    "select": {
+                        "options": [
+                            *(
+                                {"value": f"{hours}", "label": f"{hours} hours"}
+                                for hours in (24, 48, 72, 168)
+                            ),
+                            {"value": LOOKAHEAD_UNBOUNDED, "label": "Unbounded"},
+                        ],
+                    },
+                },
+            ),
         },
     )
 
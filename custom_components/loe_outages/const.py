@@ -7,14 +7,24 @@ NAME: Final = "Loe Outages"
 
 # Configuration option
 CONF_GROUP: Final = "group"
+CONF_API_URL: Final = "api_url"
+CONF_LOOKAHEAD: Final = "lookahead"
+
+# Services
+SERVICE_PROFILE: Final = "profile"
+ATTR_CYCLES: Final = "cycles"
 
 # Defaults
 DEFAULT_GROUP: Final = "1.1"
+DEFAULT_LOOKAHEAD: Final = "24"
+DEFAULT_PROFILE_CYCLES: Final = 5
 
 # Consts
 UPDATE_INTERVAL: Final = 60
+API_BASE_URL: Final = "https://lps.yuriishunkin.com/api/Schedule"
 
 # Values
+LOOKAHEAD_UNBOUNDED: Final = "unbounded"
 STATE_ON: Final = "poweron"
 STATE_OFF: Final = "poweroff"
 
@@ -1,10 +1,14 @@
 """Coordinator for Loe outages integration."""
 
+import bisect
 import datetime
 import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+
 import pytz
 
-from .models import Interval
+from .models import SLOT_DURATION, Interval, floor_to_slot
 from homeassistant.components.calendar import CalendarEvent
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -13,19 +17,83 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, Upda
 from homeassistant.util import dt as dt_utils
 
 from .api import LoeOutagesApi
+from .config_flow import get_config_value
 from .const import (
+    API_BASE_URL,
+    CONF_API_URL,
     CONF_GROUP,
+    CONF_LOOKAHEAD,
+    DEFAULT_LOOKAHEAD,
     DOMAIN,
+    LOOKAHEAD_UNBOUNDED,
     STATE_OFF,
     STATE_ON,
     TRANSLATION_KEY_EVENT_OFF,
     TRANSLATION_KEY_EVENT_ON,
     UPDATE_INTERVAL,
 )
+from .ics import make_etag, render_ics
+from .profiler import LoeOutagesProfiler
 
 LOGGER = logging.getLogger(__name__)
 
 TIMEFRAME_TO_CHECK = datetime.timedelta(hours=24)
+OUTAGE_SHARE_TIMEFRAME = datetime.timedelta(hours=6)
+
+
+def parse_lookahead(value: str) -> datetime.timedelta | None:
+    """Parse the lookahead option into a horizon, None meaning unbounded."""
+    if value == LOOKAHEAD_UNBOUNDED:
+        return None
+    return datetime.timedelta(hours=int(value))
+
+
+EVENT_STATES = {
+    STATE_ON: STATE_ON,
+    STATE_OFF: STATE_OFF,
+    None: STATE_ON,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EventTimeline:
+    """Merged events of a group, pre-translated and shared between queries.
+
+    Intervals are immutable. CalendarEvent is Home Assistant's own mutable
+    dataclass, so the events handed out are shared and must be treated as
+    read-only; the calendar component and the ICS renderer only read them.
+    """
+
+    key: tuple
+    starts: tuple[datetime.datetime, ...]
+    ends: tuple[datetime.datetime, ...]
+    intervals: tuple[Interval, ...]
+    translated_intervals: tuple[Interval, ...]
+    calendar_events: tuple[CalendarEvent, ...]
+    translated_calendar_events: tuple[CalendarEvent, ...]
+
+    def index_at(self, at: datetime.datetime) -> int | None:
+        """Return the index of the event covering the given time."""
+        index = bisect.bisect_left(self.ends, at)
+        if index < len(self.starts) and self.starts[index] <= at:
+            return index
+        return None
+
+    def iter_from(self, at: datetime.datetime) -> Iterator[Interval]:
+        """Iterate raw events forward, starting with the one covering at."""
+        for index in range(bisect.bisect_left(self.ends, at), len(self.intervals)):
+            yield self.intervals[index]
+
+    def slice_between(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+    ) -> slice:
+        """Return the slice of events intersecting the given range."""
+        return slice(
+            bisect.bisect_left(self.ends, start_date),
+            bisect.bisect_right(self.starts, end_date),
+        )
 
 
 class LoeOutagesCoordinator(DataUpdateCoordinator):
@@ -44,19 +112,28 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
         self.hass = hass
         self.config_entry = config_entry
         self.translations = {}
+        self._event_name_map: dict = {}
+        self._timeline: EventTimeline | None = None
+        self._ics_cache: tuple[tuple, bytes, str] | None = None
+        self.profiler: LoeOutagesProfiler = hass.data[DOMAIN]
+        self._profiled_refresh = False
         self.group = config_entry.options.get(
             CONF_GROUP,
             config_entry.data.get(CONF_GROUP),
         )
-        self.api = LoeOutagesApi(self.group)
+        self.api = LoeOutagesApi(
+            self.group,
+            config_entry.data.get(CONF_API_URL, API_BASE_URL),
+            self.profiler,
+        )
+        self.lookahead = parse_lookahead(
+            get_config_value(config_entry, CONF_LOOKAHEAD, DEFAULT_LOOKAHEAD)
+        )
 
     @property
     def event_name_map(self) -> dict:
         """Return a mapping of event names to translations."""
-        return {
-            STATE_OFF: self.translations.get(TRANSLATION_KEY_EVENT_OFF),
-            STATE_ON: self.translations.get(TRANSLATION_KEY_EVENT_ON),
-        }
+        return self._event_name_map
 
     async def async_update_config(
         self,
@@ -64,17 +141,44 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
         config_entry: ConfigEntry,
     ) -> None:
         """Update configuration."""
+        new_lookahead = parse_lookahead(
+            get_config_value(config_entry, CONF_LOOKAHEAD, DEFAULT_LOOKAHEAD)
+        )
+        if new_lookahead != self.lookahead:
+            LOGGER.debug(
+                "Updating lookahead from %s -> %s", self.lookahead, new_lookahead
+            )
+            self.lookahead = new_lookahead
+            self.async_update_listeners()
+
         new_group = config_entry.options.get(CONF_GROUP)
         if new_group and new_group != self.group:
             LOGGER.debug("Updating group from %s -> %s", self.group, new_group)
             self.group = new_group
-            self.api = LoeOutagesApi(self.group)
-            await self.async_refresh()
+            # Schedules hold every group, so reuse what is already loaded
+            self.api.group = new_group
+            if self.api.schedules:
+                self.async_update_listeners()
+            else:
+                await self.async_refresh()
         else:
             LOGGER.debug("No group update necessary.")
 
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, profiling them when requested."""
+        if not self.profiler.active:
+            super().async_update_listeners()
+            return
+        with self.profiler.profile():
+            super().async_update_listeners()
+        if self._profiled_refresh:
+            # Only refreshes count towards cycles, not config changes
+            self._profiled_refresh = False
+            self.profiler.refresh_done(self)
+
     async def _async_update_data(self) -> None:
         """Fetch data from API."""
+        self._profiled_refresh = self.profiler.active
         try:
             await self.async_fetch_translations()
             return await self.api.async_fetch_schedules()
@@ -92,22 +196,20 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
             "common",
             [DOMAIN],
         )
+        self._event_name_map = {
+            STATE_OFF: self.translations.get(TRANSLATION_KEY_EVENT_OFF),
+            STATE_ON: self.translations.get(TRANSLATION_KEY_EVENT_ON),
+        }
         LOGGER.debug("Translations loaded: %s", self.translations)
 
     def _get_next_event_of_type(self, state_type: str) -> Interval | None:
-        """Get the next event of a specific type."""
+        """Get the next event of a specific type within the lookahead."""
         now = dt_utils.now().astimezone(pytz.UTC)
-        # Sort events to handle multi-day spanning events correctly
-        next_events = sorted(
-            self.get_intervals_between(
-                now,
-                (now + TIMEFRAME_TO_CHECK).astimezone(pytz.UTC),
-                translate=False,
-            ),
-            key=lambda event: event.startTime,
-        )
-        LOGGER.debug("Next events: %s", next_events)
-        for event in next_events:
+        limit = now + self.lookahead if self.lookahead is not None else None
+        # Walk forward from the current event and stop at the first match
+        for event in self._get_timeline().iter_from(now):
+            if limit is not None and event.startTime > limit:
+                break
             if self._event_to_state(event) == state_type and event.startTime > now:
                 return event
         return None
@@ -133,10 +235,122 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
         event = self.get_interval_at(now)
         return self._event_to_state(event)
 
+    def _get_off_bitmaps(
+        self,
+        start: datetime.datetime,
+        timeframe: datetime.timedelta,
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """Get (covered, off) slot bitmaps of all groups from the slot at start."""
+        return self.api.get_off_bitmaps(
+            floor_to_slot(start),
+            timeframe // SLOT_DURATION,
+        )
+
+    @property
+    def groups_off(self) -> int | None:
+        """Get the number of groups without electricity right now."""
+        now = dt_utils.now().astimezone(pytz.UTC)
+        covered, off = self._get_off_bitmaps(now, SLOT_DURATION)
+        if not any(bitmap & 1 for bitmap in covered.values()):
+            return None
+        return sum(bitmap & 1 for bitmap in off.values())
+
+    @property
+    def outage_share(self) -> float | None:
+        """Get the share of known group slots without electricity ahead."""
+        now = dt_utils.now().astimezone(pytz.UTC)
+        covered, off = self._get_off_bitmaps(now, OUTAGE_SHARE_TIMEFRAME)
+        known = sum(bitmap.bit_count() for bitmap in covered.values())
+        if not known:
+            return None
+        off_slots = sum(bitmap.bit_count() for bitmap in off.values())
+        return round(100 * off_slots / known, 1)
+
+    @property
+    def hours_until_all_groups_on(self) -> float | None:
+        """Get hours until every configured group has electricity at once."""
+        now = dt_utils.now().astimezone(pytz.UTC)
+        covered, off = self._get_off_bitmaps(now, TIMEFRAME_TO_CHECK)
+        groups = {
+            entry.runtime_data.group
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if isinstance(getattr(entry, "runtime_data", None), LoeOutagesCoordinator)
+        }
+        slots = TIMEFRAME_TO_CHECK // SLOT_DURATION
+        any_off = 0
+        all_covered = (1 << slots) - 1
+        for group in groups:
+            any_off |= off.get(group, 0)
+            all_covered &= covered.get(group, 0)
+        # Index of the lowest zero bit is the first slot with all groups on
+        first_on = (~any_off & (any_off + 1)).bit_length() - 1
+        if first_on >= slots or not (all_covered >> first_on) & 1:
+            # Past the horizon, or in slots without a published schedule
+            return None
+        # Slots count from the start of the current slot, not from now
+        until = first_on * SLOT_DURATION - (now - floor_to_slot(now))
+        return max(until, datetime.timedelta(0)) / datetime.timedelta(hours=1)
+
+    def _get_timeline(self) -> EventTimeline:
+        """Get the merged events of the group, built once per revision."""
+        event_name_map = self.event_name_map
+        key = (
+            self.api.revision,
+            self.group,
+            event_name_map.get(STATE_OFF),
+            event_name_map.get(STATE_ON),
+        )
+        if self._timeline is not None and self._timeline.key == key:
+            return self._timeline
+
+        if not self.profiler.active:
+            return self._build_timeline(key, event_name_map)
+        with self.profiler.profile():
+            return self._build_timeline(key, event_name_map)
+
+    def _build_timeline(self, key: tuple, event_name_map: dict) -> EventTimeline:
+        """Merge and pre-translate the events of the group."""
+        intervals = self.api.get_timeline()
+        LOGGER.debug("Building %s events for group %s", len(intervals), self.group)
+        self._timeline = EventTimeline(
+            key=key,
+            starts=tuple(interval.startTime for interval in intervals),
+            ends=tuple(interval.endTime for interval in intervals),
+            intervals=tuple(intervals),
+            translated_intervals=tuple(
+                Interval(
+                    state=event_name_map.get(interval.state) or interval.state,
+                    startTime=interval.startTime,
+                    endTime=interval.endTime,
+                )
+                for interval in intervals
+            ),
+            calendar_events=tuple(
+                CalendarEvent(
+                    summary=interval.state,
+                    start=interval.startTime,
+                    end=interval.endTime,
+                    description=interval.state,
+                )
+                for interval in intervals
+            ),
+            translated_calendar_events=tuple(
+                CalendarEvent(
+                    summary=event_name_map.get(interval.state) or interval.state,
+                    start=interval.startTime,
+                    end=interval.endTime,
+                    description=interval.state,
+                )
+                for interval in intervals
+            ),
+        )
+        return self._timeline
+
     def get_interval_at(self, at: datetime.datetime) -> Interval | None:
         """Get the current event."""
-        event = self.api.get_current_event(at)
-        return self._get_interval_event(event, translate=False)
+        timeline = self._get_timeline()
+        index = timeline.index_at(at.astimezone(pytz.UTC))
+        return timeline.intervals[index] if index is not None else None
 
     def get_intervals_between(
         self,
@@ -146,41 +360,15 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
         translate: bool = True,
     ) -> list[Interval]:
         """Get all events."""
-        events = self.api.get_events(start_date, end_date)
-        return [
-            self._get_interval_event(event, translate=translate) for event in events
-        ]
-
-    def _get_interval_event(
-        self,
-        interval: Interval | None,
-        *,
-        translate: bool = True,
-    ) -> Interval:
-        """Transform an event into a Inteval."""
-        if not interval:
-            return None
-
-        interval_summary = interval.state
-        translated_summary = self.event_name_map.get(interval_summary)
-
-        LOGGER.debug(
-            "Transforming event: %s (%s -> %s)",
-            interval_summary,
-            interval.startTime,
-            interval.endTime,
-        )
-
-        return Interval(
-            state=translated_summary if translate else interval_summary,
-            startTime=interval.startTime,
-            endTime=interval.endTime,
-        )
+        timeline = self._get_timeline()
+        events = timeline.translated_intervals if translate else timeline.intervals
+        return list(events[timeline.slice_between(start_date, end_date)])
 
     def get_calendar_at(self, at: datetime.datetime) -> CalendarEvent | None:
         """Get the current event."""
-        event = self.api.get_current_event(at)
-        return self._get_calendar_event(event, translate=False)
+        timeline = self._get_timeline()
+        index = timeline.index_at(at.astimezone(pytz.UTC))
+        return timeline.calendar_events[index] if index is not None else None
 
     def get_calendar_between(
         self,
@@ -190,42 +378,37 @@ class LoeOutagesCoordinator(DataUpdateCoordinator):
         translate: bool = True,
     ) -> list[CalendarEvent]:
         """Get all events."""
-        events = self.api.get_events(start_date, end_date)
-        return [
-            self._get_calendar_event(event, translate=translate) for event in events
-        ]
-
-    def _get_calendar_event(
-        self,
-        interval: Interval | None,
-        *,
-        translate: bool = True,
-    ) -> CalendarEvent:
-        """Transform an event into a Inteval."""
-        if not interval:
-            return None
-
-        interval_summary = interval.state
-        translated_summary = self.event_name_map.get(interval_summary)
-
-        LOGGER.debug(
-            "Transforming event: %s (%s -> %s)",
-            interval_summary,
-            interval.startTime,
-            interval.endTime,
+        timeline = self._get_timeline()
+        events = (
+            timeline.translated_calendar_events
+            if translate
+            else timeline.calendar_events
         )
+        return list(events[timeline.slice_between(start_date, end_date)])
 
-        return CalendarEvent(
-            summary=translated_summary if translate else interval_summary,
-            start=interval.startTime,
-            end=interval.endTime,
-            description=interval_summary,
-        )
+    def get_ics_feed(self) -> tuple[bytes, str]:
+        """Get the iCalendar feed and its ETag, rendered once per revision."""
+        # Same key as the timeline, so it follows the translated event names
+        key = self._get_timeline().key
+        if self._ics_cache is not None and self._ics_cache[0] == key:
+            return self._ics_cache[1], self._ics_cache[2]
+
+        events = []
+        if self.api.schedules:
+            events = [
+                event
+                for event in self.get_calendar_between(
+                    self.api.schedules[0].date,
+                    self.api.schedules[-1].date + datetime.timedelta(days=2),
+                )
+                if event.description == STATE_OFF
+            ]
+        body = render_ics(self.group, events, dt_utils.utcnow())
+        etag = make_etag(body)
+        LOGGER.debug("Rendered ICS feed for %s (%s bytes)", self.group, len(body))
+        self._ics_cache = (key, body, etag)
+        return body, etag
 
     def _event_to_state(self, event: Interval | None) -> str:
         state = event.state if event else None
-        return {
-            STATE_ON: STATE_ON,
-            STATE_OFF: STATE_OFF,
-            None: STATE_ON,
-        }[state]
+        return EVENT_STATES[state]
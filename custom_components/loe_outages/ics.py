@@ -0,0 +1,104 @@
+"""iCalendar feed for Loe outages integration."""
+
+import datetime
+import hashlib
+import logging
+from http import HTTPStatus
+
+from aiohttp import hdrs, web
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN, NAME, UPDATE_INTERVAL
+
+LOGGER = logging.getLogger(__name__)
+
+ICS_CONTENT_TYPE = "text/calendar"
+
+
+def _format_time(value: datetime.datetime) -> str:
+    return value.astimezone(datetime.UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def render_ics(
+    group: str,
+    events: list[CalendarEvent],
+    stamp: datetime.datetime,
+) -> bytes:
+    """Render calendar events as an iCalendar document."""
+    dtstamp = _format_time(stamp)
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{NAME}//{DOMAIN}//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape_text(f'{NAME} {group}')}",
+    ]
+    for event in events:
+        start = _format_time(event.start)
+        lines.extend(
+            (
+                "BEGIN:VEVENT",
+                f"UID:{start}-{group}@{DOMAIN}",
+                f"DTSTAMP:{dtstamp}",
+                f"DTSTART:{start}",
+                f"DTEND:{_format_time(event.end)}",
+                f"SUMMARY:{_escape_text(event.summary or event.description)}",
+                "END:VEVENT",
+            )
+        )
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def make_etag(body: bytes) -> str:
+    """Return a strong ETag for the rendered feed."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check If-None-Match using weak comparison, as RFC 9110 requires."""
+    # Proxies compressing the feed often weaken the ETag to W/"..."
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+class LoeOutagesIcsView(HomeAssistantView):
+    """Serve the outages timeline of a config entry as an iCalendar feed."""
+
+    url = "/api/loe_outages/{entry_id}.ics"
+    name = "api:loe_outages:ics"
+    # Entry ids are unguessable and the schedules are public anyway
+    requires_auth = False
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the cached feed or 304 when the client copy is current."""
+        hass = request.app[KEY_HASS]
+        entry = hass.config_entries.async_get_entry(entry_id)
+        coordinator = getattr(entry, "runtime_data", None) if entry else None
+        if entry is None or entry.domain != DOMAIN or coordinator is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        body, etag = coordinator.get_ics_feed()
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.CACHE_CONTROL: f"public, max-age={UPDATE_INTERVAL}",
+        }
+        if etag_matches(request.headers.get(hdrs.IF_NONE_MATCH, ""), etag):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(
+            body=body,
+            content_type=ICS_CONTENT_TYPE,
+            charset="utf-8",
+            headers=headers,
+        )
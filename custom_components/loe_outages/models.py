@@ -2,17 +2,37 @@ import datetime
 import pytz
 import logging
 
+from .const import STATE_OFF
+
 utc = pytz.UTC
 LOGGER = logging.getLogger(__name__)
 
+SLOT_DURATION = datetime.timedelta(minutes=15)
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=utc)
+
+
+def floor_to_slot(at: datetime.datetime) -> datetime.datetime:
+    return at - (at - EPOCH) % SLOT_DURATION
+
+
+def shift_bits(bits: int, slots: int) -> int:
+    return bits << slots if slots >= 0 else bits >> -slots
+
 
 class Interval:
+    """Immutable interval, so instances can be shared between callers."""
+
+    __slots__ = ("state", "startTime", "endTime")
+
     def __init__(
         self, state: str, startTime: datetime.datetime, endTime: datetime.datetime
     ):
-        self.state = state
-        self.startTime = startTime
-        self.endTime = endTime
+        object.__setattr__(self, "state", state)
+        object.__setattr__(self, "startTime", startTime)
+        object.__setattr__(self, "endTime", endTime)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
     @staticmethod
     def from_dict(obj: dict) -> "Interval":
@@ -50,6 +70,21 @@ class Group:
             "intervals": [interval.to_dict() for interval in self.intervals],
         }
 
+    def to_bitmaps(self, origin: datetime.datetime) -> tuple[int, int]:
+        """Return (covered, off) slot bitmaps, bit 0 being the slot at origin."""
+        covered = 0
+        off = 0
+        for interval in self.intervals:
+            first = max((interval.startTime - origin) // SLOT_DURATION, 0)
+            last = -((origin - interval.endTime) // SLOT_DURATION)
+            if last <= first:
+                continue
+            mask = ((1 << (last - first)) - 1) << first
+            covered |= mask
+            if interval.state == STATE_OFF:
+                off |= mask
+        return covered, off
+
 
 class OutageSchedule:
     def __init__(
@@ -65,6 +100,12 @@ class OutageSchedule:
         self.dateString = dateString
         self.imageUrl = imageUrl
         self.groups = groups
+        self.covered_bitmaps: dict[str, int] = {}
+        self.off_bitmaps: dict[str, int] = {}
+        for group in groups:
+            covered, off = group.to_bitmaps(date)
+            self.covered_bitmaps[group.id] = covered
+            self.off_bitmaps[group.id] = off
 
     @staticmethod
     def from_list(obj_list: list[dict]) -> list["OutageSchedule"]:
@@ -0,0 +1,178 @@
+"""On-demand profiler for Loe outages integration."""
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_utils
+
+from .const import ATTR_CYCLES, DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+TOP_FUNCTIONS = 50
+TOP_ALLOCATIONS = 25
+PROFILE_TIMEOUT = 3600
+# Allocations are reported for this package only
+TRACE_FILTERS = [tracemalloc.Filter(True, str(Path(__file__).parent / "*"))]
+
+
+class LoeOutagesProfiler:
+    """Profile refresh and entity update cycles on request.
+
+    Only synchronous sections are profiled (parsing, timeline building and
+    listener updates), so the report is not polluted by whatever else the
+    event loop runs while a fetch is waiting on the network. A cycle is one
+    refresh round, finished once every loaded entry has refreshed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.active = False
+        self._remaining = 0
+        self._depth = 0
+        self._profile: cProfile.Profile | None = None
+        self._started_tracemalloc = False
+        self._start_snapshot: tracemalloc.Snapshot | None = None
+        self._refreshed: set[object] = set()
+        self._cancel_timeout: Callable[[], None] | None = None
+        self._report_task: asyncio.Task | None = None
+
+    async def async_handle_service(self, call: ServiceCall) -> None:
+        """Start profiling the next refresh cycles, or stop with zero cycles."""
+        cycles = call.data[ATTR_CYCLES]
+        if cycles == 0:
+            if self.active:
+                LOGGER.info("Profiling stopped on request")
+                self._finish()
+            return
+        if self.active or (self._report_task and not self._report_task.done()):
+            LOGGER.warning("Profiling is already running")
+            return
+        self._remaining = cycles
+        self._refreshed = set()
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        self._start_snapshot = await self.hass.async_add_executor_job(
+            tracemalloc.take_snapshot
+        )
+        self._cancel_timeout = async_call_later(
+            self.hass, PROFILE_TIMEOUT, self._async_timeout
+        )
+        self.active = True
+        LOGGER.info("Profiling the next %s refresh cycles", cycles)
+
+    @callback
+    def _async_timeout(self, _now: object) -> None:
+        self._cancel_timeout = None
+        if self.active:
+            LOGGER.warning("Profiling timed out after %s seconds", PROFILE_TIMEOUT)
+            self._finish()
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Profile the wrapped synchronous code, allowing nested sections."""
+        self._depth += 1
+        if self._depth == 1:
+            self._profile.enable()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._profile.disable()
+
+    def refresh_done(self, coordinator: object) -> None:
+        """Track a refreshed entry and write the report after the last round."""
+        self._refreshed.add(coordinator)
+        loaded = {
+            entry.runtime_data
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        }
+        if not loaded <= self._refreshed:
+            return
+        self._refreshed = set()
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._finish()
+
+    def _finish(self) -> None:
+        """Stop profiling and write the report in the executor."""
+        self.active = False
+        if self._cancel_timeout is not None:
+            self._cancel_timeout()
+            self._cancel_timeout = None
+        profile, self._profile = self._profile, None
+        start_snapshot, self._start_snapshot = self._start_snapshot, None
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile_{dt_utils.utcnow():%Y%m%d%H%M%S}.txt"
+        )
+        self._report_task = self.hass.async_create_background_task(
+            self._async_write_report(
+                profile, start_snapshot, self._started_tracemalloc, path
+            ),
+            f"{DOMAIN} profile report",
+        )
+
+    async def _async_write_report(
+        self,
+        profile: cProfile.Profile,
+        start_snapshot: tracemalloc.Snapshot,
+        stop_tracemalloc: bool,  # noqa: FBT001
+        path: str,
+    ) -> None:
+        try:
+            await self.hass.async_add_executor_job(
+                self._write_report, profile, start_snapshot, stop_tracemalloc, path
+            )
+        except Exception:  # noqa: BLE001
+            LOGGER.exception("Cannot write profile to %s", path)
+
+    @staticmethod
+    def _write_report(
+        profile: cProfile.Profile,
+        start_snapshot: tracemalloc.Snapshot,
+        stop_tracemalloc: bool,  # noqa: FBT001
+        path: str,
+    ) -> None:
+        try:
+            allocations = (
+                tracemalloc.take_snapshot()
+                .filter_traces(TRACE_FILTERS)
+                .compare_to(start_snapshot.filter_traces(TRACE_FILTERS), "lineno")
+            )
+        finally:
+            if stop_tracemalloc:
+                tracemalloc.stop()
+        stats = io.StringIO()
+        profile.create_stats()
+        if profile.stats:
+            pstats.Stats(profile, stream=stats).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(TOP_FUNCTIONS)
+        else:
+            stats.write("No refresh cycles were profiled.\n")
+        report = "\n".join(
+            (
+                stats.getvalue(),
+                f"Top {TOP_ALLOCATIONS} allocation changes in {DOMAIN} since start:",
+                *(str(stat) for stat in allocations[:TOP_ALLOCATIONS]),
+                "",
+            )
+        )
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(report)
+        LOGGER.info("Profile written to %s", path)
@@ -8,8 +8,10 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -56,6 +58,33 @@ SENSOR_TYPES: tuple[LoeOutagesSensorDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         val_func=lambda coordinator: coordinator.next_connectivity,
     ),
+    # City-wide aggregates, the same for every entry, so disabled by default
+    LoeOutagesSensorDescription(
+        key="groups_off",
+        translation_key="groups_off",
+        icon="mdi:transmission-tower-off",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        val_func=lambda coordinator: coordinator.groups_off,
+    ),
+    LoeOutagesSensorDescription(
+        key="outage_share",
+        translation_key="outage_share",
+        icon="mdi:city-variant-outline",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        val_func=lambda coordinator: coordinator.outage_share,
+    ),
+    LoeOutagesSensorDescription(
+        key="hours_until_all_groups_on",
+        translation_key="hours_until_all_groups_on",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        entity_registry_enabled_default=False,
+        val_func=lambda coordinator: coordinator.hours_until_all_groups_on,
+    ),
 )
 
 